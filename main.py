@@ -1,3 +1,8 @@
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
 from fastapi import FastAPI, Request, Depends, HTTPException, status
 from src.routes import contacts, auth, users
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,16 +18,19 @@ from sqlalchemy.orm import Session
 from src.database.db import get_db
 
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-origins = ["*"]
+app = FastAPI()
 
+# CORS is the outermost middleware, so preflight requests are answered before routing,
+# auth or the database; browsers cache the answer for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=config.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,
 )
 
 
@@ -32,8 +40,32 @@ app.include_router(contacts.router, prefix="/api")
 
 
 
+def setup_logging() -> QueueListener:
+    """
+    The setup_logging function configures the root logger once for the whole application.
+        Records are put on a queue by the QueueHandler and formatted and written to stderr
+        by a QueueListener thread, so log I/O does not happen on the event loop.
+
+    :return: The started QueueListener
+    :doc-author: Trelent
+    """
+    log_queue = queue.Queue(-1)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+    # Only merge the message (and traceback) here; the listener's handler applies the real format
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    # force=True replaces the handler of an earlier call (shutdown + startup in one process),
+    # whose listener is already stopped
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
+    listener.start()
+    return listener
+
+
 @app.on_event("startup")
 async def startup():
+    app.state.log_listener = setup_logging()
     r = await redis.Redis(
         host=config.REDIS_DOMAIN,
         port=config.REDIS_PORT,
@@ -43,24 +75,73 @@ async def startup():
     await FastAPILimiter.init(r)
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.log_listener.stop()
+
+
 
 @app.get("/", tags=["Root"])
 async def root():
     return {"message": "Hello FastApi"}
 
 
-@app.get("/api/healthchecker")
-async def healthchecker(db: AsyncSession = Depends(get_db)):
+# Last successful database probe, shared by healthchecker and readiness
+HEALTHCHECK_TTL = 2.0
+_hc_cache = {"ts": 0.0, "ok": False}
+
+
+async def check_database(db: AsyncSession):
+    """
+    The check_database function makes sure the database answers a trivial query.
+        A successful probe is remembered for HEALTHCHECK_TTL seconds, so frequent probes
+        cost at most one real database round-trip per interval.
+
+    :param db: AsyncSession: Get the database session
+    :return: Nothing, raises HTTPException if the database is not reachable
+    :doc-author: Trelent
+    """
+    now = time.monotonic()
+    if _hc_cache["ok"] and now - _hc_cache["ts"] < HEALTHCHECK_TTL:
+        return
     try:
         # Make request
         result = await db.execute(text("SELECT 1"))
         result = result.fetchone()
         if result is None:
             raise HTTPException(status_code=500, detail="Database is not configured correctly")
-        return {"message": "Welcome to FastAPI!"}
+        _hc_cache.update(ts=now, ok=True)
     except Exception as e:
-        print(e)
+        _hc_cache["ok"] = False
+        logger.exception("Database health check failed")
         raise HTTPException(status_code=500, detail="Error connecting to the database")
 
-    
 
+@app.get("/api/healthchecker")
+async def healthchecker(db: AsyncSession = Depends(get_db)):
+    await check_database(db)
+    return {"message": "Welcome to FastAPI!"}
+
+
+@app.get("/api/liveness")
+async def liveness():
+    """
+    The liveness function reports that the process is up; it never touches the database.
+
+    :return: A dict with a message
+    :doc-author: Trelent
+    """
+    return {"message": "OK"}
+
+
+@app.get("/api/readiness")
+async def readiness(db: AsyncSession = Depends(get_db)):
+    """
+    The readiness function reports whether the service can reach the database.
+
+    :param db: AsyncSession: Get the database session
+    :return: A dict with a message
+    :doc-author: Trelent
+    """
+    await check_database(db)
+    return {"message": "OK"}
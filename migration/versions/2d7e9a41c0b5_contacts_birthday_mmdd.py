@@ -0,0 +1,39 @@
+"""Contacts birthday_mmdd
+
+Revision ID: 2d7e9a41c0b5
+Revises: 8f3b2c71d4a9
+Create Date: 2024-06-11 21:03:17.842960
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7e9a41c0b5'
+down_revision: Union[str, None] = '8f3b2c71d4a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('birthday_mmdd', sa.SmallInteger(), nullable=True))
+    op.execute(
+        "UPDATE contacts SET birthday_mmdd = EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) "
+        "WHERE birthday IS NOT NULL"
+    )
+    op.create_index('ix_contacts_user_birthday_mmdd', 'contacts', ['user_id', 'birthday_mmdd'])
+    # get_birthdays filters on the persisted column now
+    op.drop_index('ix_contacts_user_mmdd', table_name='contacts')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_contacts_user_mmdd',
+        'contacts',
+        ['user_id', sa.text('(CAST(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) AS INTEGER))')],
+    )
+    op.drop_index('ix_contacts_user_birthday_mmdd', table_name='contacts')
+    op.drop_column('contacts', 'birthday_mmdd')
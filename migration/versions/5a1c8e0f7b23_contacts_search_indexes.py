@@ -0,0 +1,48 @@
+"""Contacts search indexes
+
+Revision ID: 5a1c8e0f7b23
+Revises: 2d7e9a41c0b5
+Create Date: 2024-06-12 18:47:05.219336
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a1c8e0f7b23'
+down_revision: Union[str, None] = '2d7e9a41c0b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_user_id', 'contacts', ['user_id'])
+
+    # Trigram GIN indexes serve search's ILIKE '%...%' on the plain columns
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_contacts_{column}_trgm',
+            'contacts',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email', table_name='users')
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
+
+    for column in TRGM_COLUMNS:
+        op.drop_index(f'ix_contacts_{column}_trgm', table_name='contacts')
+
+    op.drop_index('ix_contacts_user_id', table_name='contacts')
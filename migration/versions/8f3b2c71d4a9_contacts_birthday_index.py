@@ -0,0 +1,30 @@
+"""Contacts birthday index
+
+Revision ID: 8f3b2c71d4a9
+Revises: 1c22ed92a813
+Create Date: 2024-06-10 19:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b2c71d4a9'
+down_revision: Union[str, None] = '1c22ed92a813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_contacts_user_mmdd',
+        'contacts',
+        ['user_id', sa.text('(CAST(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) AS INTEGER))')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_mmdd', table_name='contacts')
@@ -0,0 +1,35 @@
+"""Contacts prefix search indexes
+
+Revision ID: b94d3f6a2e18
+Revises: 5a1c8e0f7b23
+Create Date: 2024-06-13 20:15:52.670184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b94d3f6a2e18'
+down_revision: Union[str, None] = '5a1c8e0f7b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREFIX_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    # B-tree range scans for search(prefix=True): lower(column) LIKE 'x%'
+    for column in PREFIX_COLUMNS:
+        op.create_index(
+            f'ix_contacts_{column}_lower_prefix',
+            'contacts',
+            [sa.text(f'lower({column}) text_pattern_ops')],
+        )
+
+
+def downgrade() -> None:
+    for column in PREFIX_COLUMNS:
+        op.drop_index(f'ix_contacts_{column}_lower_prefix', table_name='contacts')
@@ -0,0 +1,29 @@
+"""Contacts keyset index
+
+Revision ID: e61f0b8c5d47
+Revises: b94d3f6a2e18
+Create Date: 2024-06-14 17:38:26.105447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61f0b8c5d47'
+down_revision: Union[str, None] = 'b94d3f6a2e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, id) serves "user_id = :u AND id > :after ORDER BY id" and covers plain user_id lookups
+    op.create_index('ix_contacts_user_id_id', 'contacts', ['user_id', 'id'])
+    op.drop_index('ix_contacts_user_id', table_name='contacts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_contacts_user_id', 'contacts', ['user_id'])
+    op.drop_index('ix_contacts_user_id_id', table_name='contacts')
@@ -1,11 +1,30 @@
 import contextlib
+import logging
+from fastapi import HTTPException
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from src.conf.config import config  # Импортируем наш конфиг
 
+logger = logging.getLogger(__name__)
+
+
+def engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": True, "echo": config.DB_ECHO}
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        options.update(pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW)
+    if url.get_driver_name() == "asyncpg":
+        # Кэш подготовленных выражений на соединение: повторные запросы не разбираются и не планируются заново
+        options["connect_args"] = {"prepared_statement_cache_size": 256, "statement_cache_size": 1024}
+    return options
+
+
 class DatabaseSessionManager:
     def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)  # Создаем асинхронный движок SQLAlchemy
+        self._engine: AsyncEngine | None = create_async_engine(url, **engine_options(url))  # Создаем асинхронный движок SQLAlchemy
+        # expire_on_commit=False: объекты остаются загруженными после commit(), без ленивой подгрузки в async
         self._session_maker: async_sessionmaker = async_sessionmaker(autoflush=False, autocommit=False,
+                                                                     expire_on_commit=False,
                                                                      bind=self._engine)  # Создаем фабрику сессий
 
     @contextlib.asynccontextmanager
@@ -15,9 +34,13 @@ class DatabaseSessionManager:
         session = self._session_maker()  # Создаем асинхронную сессию
         try:
             yield session  # Передаем сессию в контекст управления
-        except Exception as err:
-            print(err)  # Выводим ошибку
+        except HTTPException:
+            await session.rollback()  # Обычный ответ клиенту (401, 404, 409), в журнал не пишем
+            raise
+        except Exception:
+            logger.exception("Session rollback")  # Записываем ошибку вместе с трассировкой
             await session.rollback()  # Откатываем транзакцию при ошибке
+            raise  # Не скрываем исключение от вызывающего кода
         finally:
             await session.close()  # Закрываем сессию
 
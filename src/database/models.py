@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Integer, ForeignKey, Boolean, func
+from sqlalchemy import String, DateTime, Integer, SmallInteger, ForeignKey, Boolean, Index, event, func
 import datetime
 
 
@@ -7,26 +7,59 @@ class Base(DeclarativeBase):
     pass
 
 
+def birthday_key(birthday: datetime.date | None) -> int | None:
+    # month*100+day, e.g. 1231 for December 31
+    if birthday is None:
+        return None
+    return birthday.month * 100 + birthday.day
+
+
 class Contact(Base):
     __tablename__ = 'contacts'
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_birthday_mmdd", "user_id", "birthday_mmdd"),
+        # Trigram GIN indexes for search's ILIKE '%...%'; postgresql_* options are ignored elsewhere
+        *(
+            Index(f"ix_contacts_{column}_trgm", column,
+                  postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in ("first_name", "last_name", "email")
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(50), nullable=False)
     phone_number: Mapped[str] = mapped_column(String(50), nullable=False)
     birthday: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=True)
+    birthday_mmdd: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.now)
     updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.now, onupdate=datetime.datetime.now)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=True, default=1)
     user: Mapped["User"] = relationship("User", back_populates="contacts")
 
 
+# B-tree indexes for search(prefix=True): lower(column) LIKE 'x%'
+for _column in (Contact.first_name, Contact.last_name, Contact.email):
+    Index(
+        f"ix_contacts_{_column.key}_lower_prefix",
+        func.lower(_column).label(f"{_column.key}_lower"),
+        postgresql_ops={f"{_column.key}_lower": "text_pattern_ops"},
+    )
+
+
+@event.listens_for(Contact, "before_insert")
+@event.listens_for(Contact, "before_update")
+def set_birthday_mmdd(mapper, connection, target: Contact):
+    target.birthday_mmdd = birthday_key(target.birthday)
+
+
 # Модель пользователя
 class User(Base):
     __tablename__ = "users"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     username: Mapped[str] = mapped_column(String(150), nullable=False)
-    email: Mapped[str] = mapped_column(String(150), nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(String(150), nullable=False, unique=True, index=True)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     refresh_token: Mapped[str | None] = mapped_column(String(255), nullable=True)
     avatar: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -2,24 +2,25 @@ import logging
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.contacts import  ContactCreate, ContactInDB, ContactUpdate, ContactBase
-from src.database.models import Contact, User
-from sqlalchemy import select, extract
+from src.database.models import Contact, User, birthday_key
+from sqlalchemy import select, update, delete, or_, func
+from sqlalchemy.orm import selectinload
 from datetime import date, timedelta
 
-# Создание логгера
+# Создание логгера; обработчики настраиваются один раз при старте приложения (main.setup_logging)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-# Создание обработчика для вывода логов в консоль
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
+# Rows fetched per round-trip from the server-side cursor of list queries
+STREAM_BATCH_SIZE = 100
 
-# Создание форматировщика для логов
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
 
-# Добавление обработчика к логгеру
-logger.addHandler(console_handler)
+def _select_contacts(expand: bool = False):
+    # selectin keeps Contact -> User to one extra "WHERE id IN (...)" query per page
+    stmt = select(Contact)
+    if expand:
+        stmt = stmt.options(selectinload(Contact.user))
+    return stmt
+
 
 async def create(body: ContactCreate, db: AsyncSession, user:User):
     """
@@ -49,20 +50,25 @@ async def create(body: ContactCreate, db: AsyncSession, user:User):
 
 
 
-async def get_contacts(limit: int, offset: int, db: AsyncSession, user:User):
+async def get_contacts(limit: int, after_id: int | None, db: AsyncSession, user:User, expand: bool = False):
     """
-    The get_contacts function returns a list of contacts for the user.
+    The get_contacts function returns a page of contacts for the user, ordered by id.
+        Pages are keyset based: the next page starts after the last id of the previous one,
+        so the cost of a page does not grow with its depth.
     
     :param limit: int: Limit the number of contacts returned
-    :param offset: int: Specify the number of records to skip before returning
+    :param after_id: int | None: Return only contacts with a greater id, None for the first page
     :param db: AsyncSession: Pass the database session to the function
     :param user:User: Filter the contacts by user_id
-    :return: A list of contact objects
+    :param expand: bool: Eager-load the owner of every contact
+    :return: An async stream of contact objects
     :doc-author: Trelent
     """
-    stmt = select(Contact).filter_by(user_id=user.id).offset(offset).limit(limit)
-    contacts = await db.execute(stmt)
-    return contacts.scalars().all()
+    stmt = _select_contacts(expand).filter_by(user_id=user.id)
+    if after_id is not None:
+        stmt = stmt.filter(Contact.id > after_id)
+    stmt = stmt.order_by(Contact.id).limit(limit)
+    return await db.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
 
 
 async def get_contact(contact_id: int, db: AsyncSession, user:User):
@@ -101,17 +107,19 @@ async def update_contact(contact_id: int, body: ContactUpdate, db: AsyncSession,
     :return: A contact object
     :doc-author: Trelent
     """
-    stmt = select(Contact).filter_by(id=contact_id, user_id=user.id)
+    values = body.model_dump(exclude_unset=True)
+    if "birthday" in values:
+        # Bulk UPDATE skips the before_update listener
+        values["birthday_mmdd"] = birthday_key(values["birthday"])
+    stmt = (
+        update(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == user.id)
+        .values(**values)
+        .returning(Contact)
+    )
     result = await db.execute(stmt)
     contact = result.scalar_one_or_none()
-    if contact:
-        contact.first_name = body.first_name
-        contact.last_name = body.last_name
-        contact.email = body.email
-        contact.phone_number = body.phone_number
-        contact.birthday = body.birthday
-        await db.commit()
-        await db.refresh(contact)
+    await db.commit()
     return contact
 
 
@@ -129,43 +137,58 @@ async def delete_contact(contact_id: int, db: AsyncSession, user:User):
     :return: The contact object that was deleted
     :doc-author: Trelent
     """
-    stmt = select(Contact).filter_by(id=contact_id, user_id=user.id)
-    contact = await db.execute(stmt)
-    contact = contact.scalar_one_or_none()
-    if contact:
-        await db.delete(contact)
-        await db.commit()
+    stmt = (
+        delete(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == user.id)
+        .returning(Contact)
+    )
+    result = await db.execute(stmt)
+    contact = result.scalar_one_or_none()
+    await db.commit()
     return contact
 
 
 
-async def get_birthdays(days, db: AsyncSession, user:User):
+async def get_birthdays(days, db: AsyncSession, user:User, expand: bool = False):
     """
     The get_birthdays function returns a list of contacts that have birthdays within the next `days` days.
+        The window is computed in Python as a pair of month*100+day keys, so a window that crosses
+        the end of the year (December -> January) is split into two ranges.
     
     :param days: Determine how many days in the future to look for birthdays
     :param db: AsyncSession: Pass the database session to the function
     :param user:User: Filter the contacts by user
-    :return: A list of contacts
+    :param expand: bool: Eager-load the owner of every contact
+    :return: An async stream of contacts
     :doc-author: Trelent
     """
-    days:int = days + 1
-    filter_month = date.today().month
-    filter_day = date.today().day
-    
-    stmt = select(Contact).filter(
-        Contact.user_id == user.id,
-        extract('month', Contact.birthday) == filter_month,
-        extract('day', Contact.birthday) <= filter_day + days
-    )
-    
-    contacts = await db.execute(stmt)
-    return contacts.scalars().all()
-
-
-async def search(first_name, last_name, email, skip, limit, db, user:User):
+    stmt = _select_contacts(expand).where(Contact.user_id == user.id)
+    if days >= 365:
+        # A year or more covers every birthday; checked first, today + huge days overflows date
+        stmt = stmt.where(Contact.birthday_mmdd.is_not(None))
+    else:
+        today = date.today()
+        start_key = birthday_key(today)
+        end_key = birthday_key(today + timedelta(days=days))
+        if start_key <= end_key:
+            stmt = stmt.where(Contact.birthday_mmdd.between(start_key, end_key))
+        else:
+            stmt = stmt.where(or_(Contact.birthday_mmdd >= start_key, Contact.birthday_mmdd <= end_key))
+
+    return await db.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+
+def _match(column, value: str, prefix: bool):
+    if prefix:
+        # lower(column) LIKE 'x%' is served by the text_pattern_ops indexes
+        return func.lower(column).like(f"{value.lower()}%")
+    return column.ilike(f"%{value}%")
+
+
+async def search(first_name, last_name, email, skip, limit, db, user:User, expand: bool = False, prefix: bool = False):
     """
     The search function searches for contacts in the database.
+        By default every field matches anywhere in the value; with prefix=True it only matches the beginning.
     
     :param first_name: Filter contacts by first name
     :param last_name: Filter the result by last name
@@ -174,26 +197,27 @@ async def search(first_name, last_name, email, skip, limit, db, user:User):
     :param limit: Limit the number of records returned by the query
     :param db: Pass the database connection to the function
     :param user:User: Pass the user object to the function
-    :return: A list of objects
+    :param expand: bool: Eager-load the owner of every contact
+    :param prefix: bool: Match the beginning of the fields only
+    :return: An async stream of contact objects
     :doc-author: Trelent
     """
-    query = select(Contact).filter_by(user_id=user.id)
+    query = _select_contacts(expand).filter_by(user_id=user.id)
     if first_name:
-        query = query.filter(Contact.first_name.ilike(f"%{first_name}%"))
+        query = query.filter(_match(Contact.first_name, first_name, prefix))
     if last_name:
-        query = query.filter(Contact.last_name.ilike(f"%{last_name}%"))   
+        query = query.filter(_match(Contact.last_name, last_name, prefix))
     if email:
-        query = query.filter(Contact.email.ilike(f"%{email}%"))   
+        query = query.filter(_match(Contact.email, email, prefix))
     
     result_query = query.offset(skip).limit(limit)
     
     try:
-        contacts = await db.execute(result_query)
-        return contacts.scalars().all()
-    except Exception as e:
-        # Обработка исключения, запись ошибки в журнал и возврат соответствующего ответа
-        print(f"Ошибка при выполнении запроса к базе данных: {e}")
-        return []
+        return await db.stream_scalars(result_query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    except Exception:
+        # Запись ошибки в журнал вместе с трассировкой, исключение пробрасывается дальше
+        logger.exception("Error while searching contacts")
+        raise
 
 
 
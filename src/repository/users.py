@@ -1,7 +1,9 @@
+import hashlib
+
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from libgravatar import Gravatar
+from sqlalchemy.orm import load_only
 
 from src.database.db import get_db
 from src.database.models import User
@@ -28,6 +30,39 @@ async def get_user_by_email(email: str, db: AsyncSession = Depends(get_db)):
     return user
 
 
+async def get_user_by_email_light(email: str, db: AsyncSession = Depends(get_db)):
+    """
+    The get_user_by_email_light function returns a user object with only the columns needed by authenticated routes.
+        The password hash and the refresh token are not fetched; use get_user_by_email where those are needed.
+    
+    :param email: str: Pass the email address of the user to be retrieved
+    :param db: AsyncSession: Pass in the database session to the function
+    :return: A user object with id, username, email, confirmed and avatar loaded
+    :doc-author: Trelent
+    """
+    stmt = (
+        select(User)
+        .options(load_only(User.id, User.username, User.email, User.confirmed, User.avatar))
+        .filter_by(email=email)
+    )
+    user = await db.execute(stmt)
+    user = user.scalar_one_or_none()
+    return user
+
+
+def gravatar_url(email: str) -> str:
+    """
+    The gravatar_url function builds the Gravatar image url for an email address.
+        Gravatar addresses images by the md5 of the trimmed, lowercased email, so no request is made here.
+    
+    :param email: str: The email address of the user
+    :return: The avatar url
+    :doc-author: Trelent
+    """
+    email_hash = hashlib.md5(email.strip().lower().encode("utf-8")).hexdigest()
+    return f"https://www.gravatar.com/avatar/{email_hash}"
+
+
 async def create_user(body: UserSchema, db: AsyncSession = Depends(get_db)):
     """
     The create_user function creates a new user in the database.
@@ -38,14 +73,7 @@ async def create_user(body: UserSchema, db: AsyncSession = Depends(get_db)):
     :return: A user object
     :doc-author: Trelent
     """
-    avatar = None
-    try:
-        g = Gravatar(body.email)
-        avatar = g.get_image()
-    except Exception as err:
-        print(err)
-
-    new_user = User(**body.model_dump(), avatar=avatar)
+    new_user = User(**body.model_dump(), avatar=gravatar_url(body.email))
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
@@ -75,8 +103,8 @@ async def confirmed_email(email: str, db: AsyncSession) -> None:
     :return: None
     :doc-author: Trelent
     """
-    user = await get_user_by_email(email, db)
-    user.confirmed = True
+    stmt = update(User).where(User.email == email).values(confirmed=True)
+    await db.execute(stmt)
     await db.commit()
 
 
@@ -90,8 +118,13 @@ async def update_avatar_url(email: str, url: str | None, db: AsyncSession) -> Us
     :return: A user object
     :doc-author: Trelent
     """
-    user = await get_user_by_email(email, db)
-    user.avatar = url
+    stmt = (
+        update(User)
+        .where(User.email == email)
+        .values(avatar=url)
+        .returning(User)
+    )
+    result = await db.execute(stmt)
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(user)
     return user
@@ -55,6 +55,7 @@ async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession =
     access_token = await auth_service.create_access_token(data={"sub": user.email})
     refresh_token = await auth_service.create_refresh_token(data={"sub": user.email})
     await repositories_users.update_token(user, refresh_token, db)
+    await auth_service.invalidate_user(user.email)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
@@ -77,11 +78,13 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(get_
     user = await repositories_users.get_user_by_email(email, db)
     if user.refresh_token != token:
         await repositories_users.update_token(user, None, db)
+        await auth_service.invalidate_user(email)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
     access_token = await auth_service.create_access_token(data={"sub": email})
     refresh_token = await auth_service.create_refresh_token(data={"sub": email})
     await repositories_users.update_token(user, refresh_token, db)
+    await auth_service.invalidate_user(email)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
@@ -95,6 +98,7 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     await repositories_users.confirmed_email(email, db)
+    await auth_service.invalidate_user(email)
     return {"message": "Email confirmed"}
 
 
@@ -118,7 +122,7 @@ async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, r
     """
     user = await repositories_users.get_user_by_email(body.email, db)
 
-    if user.confirmed:
+    if user and user.confirmed:
         return {"message": "Your email is already confirmed"}
     if user:
         background_tasks.add_task(send_email, user.email, user.username, str(request.base_url))
@@ -1,56 +1,65 @@
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Response
 from typing import List
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncScalarResult
 from src.database.db import get_db
-from src.schemas.contacts import ContactBase, ContactCreate, ContactInDB, ContactUpdate
+from src.schemas.contacts import ContactBase, ContactCreate, ContactInDB, ContactUpdate, ContactPage, CONTACT_LIST_ADAPTER
 from src.repository import contacts as repository_contacts
 from sqlalchemy import or_, select
 from src.database.models import Contact, User
 from datetime import date, timedelta
 from src.services.auth import auth_service
+from src.services.concurrency import ConcurrencyLimiter
 
 
-# Создание логгера
+# Создание логгера; обработчики настраиваются один раз при старте приложения (main.setup_logging)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-# Создание обработчика для вывода логов в консоль
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
-
-# Создание форматировщика для логов
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
+router = APIRouter(prefix="/contacts", tags=["contacts"])
 
-# Добавление обработчика к логгеру
-logger.addHandler(console_handler)
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+async def _contacts_json(contacts: AsyncScalarResult) -> tuple[bytes, int, int | None]:
+    # Serialize batch by batch as rows come off the cursor; the session is closed
+    # before the response is sent, so the body is assembled here rather than streamed.
+    chunks = []
+    count = 0
+    last_id = None
+    async for batch in contacts.partitions():
+        validated = CONTACT_LIST_ADAPTER.validate_python(batch)
+        chunks.append(CONTACT_LIST_ADAPTER.dump_json(validated)[1:-1])
+        count += len(batch)
+        last_id = batch[-1].id
+    return b"[" + b",".join(chunks) + b"]", count, last_id
 
 
-@router.get("/", response_model=list[ContactInDB])
+@router.get("/", response_model=ContactPage)
 async def get_contacts(limit: int = Query(10, ge=10, le=500),
-                        offset: int = Query(0, ge=0),
+                        after_id: int | None = Query(None, ge=0),
+                        expand: bool = Query(False),
                     db: AsyncSession = Depends(get_db),
                     user: User = Depends(auth_service.get_current_user)):
     """
-    The get_contacts function returns a list of contacts for the current user.
-        The limit and offset parameters are used to paginate the results.
+    The get_contacts function returns a page of contacts for the current user.
+        Pass the returned next value as after_id to get the following page; next is None on the last page.
     
     
     :param limit: int: Limit the number of contacts returned
     :param ge: Specify a minimum value for the limit parameter
     :param le: Limit the number of contacts returned to 500
-    :param offset: int: Skip the first n contacts, where n is the offset
-    :param ge: Check if the limit is greater than or equal to 10
+    :param after_id: int | None: Return the contacts after this id
+    :param ge: Check if the after_id is greater than or equal to 0
+    :param expand: bool: Eager-load the owner of every contact
     :param db: AsyncSession: Pass the database session to the repository layer
     :param user: User: Get the user id from the token
-    :return: A list of contact objects
+    :return: A page with the contact objects and the next cursor
     :doc-author: Trelent
     """
-    contacts = await repository_contacts.get_contacts(limit, offset, db, user)
-    return contacts
+    contacts = await repository_contacts.get_contacts(limit, after_id, db, user, expand)
+    items, count, last_id = await _contacts_json(contacts)
+    next_id = last_id if count == limit else None
+    content = b'{"items":' + items + b',"next":' + json.dumps(next_id).encode() + b"}"
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/", response_model=ContactInDB, status_code=status.HTTP_201_CREATED)
@@ -74,8 +83,10 @@ async def create_contact(contact_data: ContactCreate,
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT FOUND")
 
 
-@router.get("/birthday", response_model=list[ContactInDB])
+@router.get("/birthday", response_model=list[ContactInDB],
+            dependencies=[Depends(ConcurrencyLimiter(max_concurrent=10))])
 async def get_birthdays(days: int = Query(7, ge=7),
+                         expand: bool = Query(False),
                          db: AsyncSession = Depends(get_db),
                          user: User = Depends(auth_service.get_current_user)):
     """
@@ -83,22 +94,27 @@ async def get_birthdays(days: int = Query(7, ge=7),
     
     :param days: int: Specify the number of days to look ahead for birthdays
     :param ge: Specify that the days parameter must be greater than or equal to 7
+    :param expand: bool: Eager-load the owner of every contact
     :param db: AsyncSession: Pass the database session to the function
     :param user: User: Get the current user
     :return: A list of contacts
     :doc-author: Trelent
     """
-    contacts = await repository_contacts.get_birthdays(days, db, user)
-    return contacts
+    contacts = await repository_contacts.get_birthdays(days, db, user, expand)
+    items, _, _ = await _contacts_json(contacts)
+    return Response(content=items, media_type="application/json")
 
 
-@router.get("/search", response_model=list[ContactInDB])
+@router.get("/search", response_model=list[ContactInDB],
+            dependencies=[Depends(ConcurrencyLimiter(max_concurrent=10))])
 async def serch(
     first_name: str = None,
     last_name: str = None,
     email: str = None,
     skip: int = 0,
     limit: int = Query(default=10, le=100, ge=10),
+    expand: bool = Query(False),
+    prefix: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(auth_service.get_current_user)
 ):
@@ -118,13 +134,16 @@ async def serch(
     :param limit: int: Limit the number of results returned
     :param le: Limit the number of results returned
     :param ge: Set a minimum value for the limit parameter
+    :param expand: bool: Eager-load the owner of every contact
+    :param prefix: bool: Match the beginning of the fields only
     :param db: AsyncSession: Get the database connection
     :param user: User: Get the user from the database
     :return: A list of contacts, but the schema is expecting a single contact
     :doc-author: Trelent
     """
-    contacts = await repository_contacts.search(first_name, last_name, email, skip, limit, db, user)
-    return contacts
+    contacts = await repository_contacts.search(first_name, last_name, email, skip, limit, db, user, expand, prefix)
+    items, _, _ = await _contacts_json(contacts)
+    return Response(content=items, media_type="application/json")
     
 @router.get("/{contact_id}", response_model=ContactInDB)
 async def get_contact(contact_id: int = Path(ge=1), 
@@ -151,7 +170,7 @@ async def get_contact(contact_id: int = Path(ge=1),
     return contact
 
 
-@router.put("/{contact_id}")
+@router.put("/{contact_id}", response_model=ContactInDB)
 async def update_contact(body: ContactUpdate, 
                          contact_id: int = Path(ge=1), 
                          db: AsyncSession = Depends(get_db),
@@ -1,4 +1,4 @@
-import pickle
+import logging
 
 import cloudinary
 import cloudinary.uploader
@@ -22,6 +22,8 @@ from src.services.auth import auth_service
 from src.conf.config import config
 from src.repository import users as repositories_users
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/users", tags=["users"])
 cloudinary.config(
     cloud_name=config.CLD_NAME,
@@ -61,11 +63,11 @@ async def get_current_user(
 ):
     public_id = f"Web16/{user.email}"
     res = cloudinary.uploader.upload(file.file, public_id=public_id, owerite=True)
-    print(res)
+    logger.debug(f"Cloudinary upload result: {res}")
     res_url = cloudinary.CloudinaryImage(public_id).build_url(
         width=250, height=250, crop="fill", version=res.get("version")
     )
     user = await repositories_users.update_avatar_url(user.email, res_url, db)
-    auth_service.cache.set(user.email, pickle.dumps(user))
-    auth_service.cache.expire(user.email, 300)
+    # RETURNING hands back the full row; the next request re-caches the light user
+    await auth_service.invalidate_user(user.email)
     return user
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
 from src.schemas.users import UserResponse
 
 class ContactBase(BaseModel):
@@ -19,10 +19,15 @@ class ContactInDB(ContactBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    created_at: datetime | None
-    updated_at: datetime | None
     #user: UserResponse | None
 
-    
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Validates/dumps a whole batch of ORM contacts in one pydantic-core call
+CONTACT_LIST_ADAPTER = TypeAdapter(list[ContactInDB])
+
+
+class ContactPage(BaseModel):
+    items: list[ContactInDB]
+    next: int | None = None
\ No newline at end of file
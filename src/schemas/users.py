@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 
@@ -16,10 +16,8 @@ class UserResponse(BaseModel):
     username: str
     email: EmailStr
     avatar: str
-    
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TokenSchema(BaseModel):
@@ -1,8 +1,10 @@
+import logging
 import pickle
 from datetime import datetime, timedelta
 from typing import Optional
 
-import redis
+import redis.asyncio as redis
+from redis.exceptions import RedisError
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
@@ -13,6 +15,8 @@ from src.database.db import get_db
 from src.repository import users as repository_users
 from src.conf.config import config
 
+logger = logging.getLogger(__name__)
+
 
 class Auth:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -24,6 +28,7 @@ class Auth:
         db=0,
         password=config.REDIS_PASSWORD,
     )
+    USER_CACHE_TTL = 300
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -106,22 +111,39 @@ class Auth:
         except JWTError as e:
             raise credentials_exception
 
-        user_hash = str(email)
-
-        user = self.cache.get(user_hash)
+        user = await self.get_cached_user(email)
 
         if user is None:
-            print("User from database")
-            user = await repository_users.get_user_by_email(email, db)
+            user = await repository_users.get_user_by_email_light(email, db)
             if user is None:
                 raise credentials_exception
-            self.cache.set(user_hash, pickle.dumps(user))
-            self.cache.expire(user_hash, 300)
-        else:
-            print("User from cache")
-            user = pickle.loads(user)
+            await self.cache_user(user)
         return user
 
+    @staticmethod
+    def _user_cache_key(email: str) -> str:
+        return f"user:{email}"
+
+    async def get_cached_user(self, email: str):
+        try:
+            raw = await self.cache.get(self._user_cache_key(email))
+        except RedisError as err:
+            logger.warning(f"User cache is unavailable: {err}")
+            return None
+        return pickle.loads(raw) if raw is not None else None
+
+    async def cache_user(self, user) -> None:
+        try:
+            await self.cache.set(self._user_cache_key(user.email), pickle.dumps(user), ex=self.USER_CACHE_TTL)
+        except RedisError as err:
+            logger.warning(f"User cache is unavailable: {err}")
+
+    async def invalidate_user(self, email: str) -> None:
+        try:
+            await self.cache.delete(self._user_cache_key(email))
+        except RedisError as err:
+            logger.warning(f"User cache is unavailable: {err}")
+
     def create_email_token(self, data: dict):
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=1)
@@ -135,7 +157,7 @@ class Auth:
             email = payload["sub"]
             return email
         except JWTError as e:
-            print(e)
+            logger.warning(f"Invalid email verification token: {e}")
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Invalid token for email verification",
@@ -0,0 +1,70 @@
+import logging
+import time
+import uuid
+
+from fastapi import Depends, HTTPException, status
+from fastapi_limiter import FastAPILimiter
+from redis.exceptions import RedisError
+
+from src.database.models import User
+from src.services.auth import auth_service
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimiter:
+    # Drop slots older than ttl (crashed requests), then take one if any is free
+    lua_script = """local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call("ZREMRANGEBYSCORE", key, "-inf", now - ttl)
+if redis.call("ZCARD", key) >= limit then
+    return 0
+end
+redis.call("ZADD", key, now, ARGV[4])
+redis.call("EXPIRE", key, ttl)
+return 1"""
+
+    def __init__(self, max_concurrent: int = 10, ttl: int = 60):
+        self.max_concurrent = max_concurrent
+        self.ttl = ttl
+        self._script = None
+
+    async def __call__(self, user: User = Depends(auth_service.get_current_user)):
+        """
+        The ConcurrencyLimiter dependency bounds the number of in-flight requests per user.
+            Every request takes a slot in a Redis sorted set keyed by the user email and gives it back
+            once the response is done. When all slots are taken the request is rejected with 429.
+            Without Redis the limit is skipped, like the user cache in auth_service.
+
+        :param user: User: The current user, used as the limiter key
+        :return: Nothing, the dependency only guards the endpoint
+        :doc-author: Trelent
+        """
+        redis = FastAPILimiter.redis
+        if redis is None:
+            logger.warning("Concurrency limiter is unavailable: FastAPILimiter is not initialized")
+            yield
+            return
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(self.lua_script)
+        key = f"{FastAPILimiter.prefix}:concurrency:{user.email}"
+        request_id = uuid.uuid4().hex
+        try:
+            acquired = await self._script(keys=[key], args=[time.time(), self.ttl, self.max_concurrent, request_id])
+        except RedisError as err:
+            logger.warning(f"Concurrency limiter is unavailable: {err}")
+            yield
+            return
+        if not acquired:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many concurrent requests")
+        try:
+            yield
+        finally:
+            try:
+                await redis.zrem(key, request_id)
+            except RedisError as err:
+                # The slot expires after ttl seconds anyway
+                logger.warning(f"Concurrency limiter is unavailable: {err}")
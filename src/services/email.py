@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
@@ -6,6 +7,8 @@ from pydantic import EmailStr
 from src.conf.config import config
 from src.services.auth import auth_service
 
+logger = logging.getLogger(__name__)
+
 conf = ConnectionConfig(
     MAIL_USERNAME=config.MAIL_USERNAME,
     MAIL_PASSWORD=config.MAIL_PASSWORD,
@@ -20,6 +23,11 @@ conf = ConnectionConfig(
     TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
 )
 
+fm = FastMail(conf)
+# FastMail builds a new jinja Environment on every send_message(template_name=...);
+# rendering through one Environment keeps the compiled template cached between emails.
+templates = conf.template_engine()
+
 
 async def send_email(email: EmailStr, username: str, host: str):
     """
@@ -37,16 +45,16 @@ async def send_email(email: EmailStr, username: str, host: str):
     """
     try:
         token_verification = auth_service.create_email_token({"sub": email})
+        template = templates.get_template("verify_email.html")
         message = MessageSchema(
             subject="Confirm your email",
             recipients=[email],
-            template_body={"host": host, "username": username, "token": token_verification},
+            body=template.render(host=host, username=username, token=token_verification),
             subtype=MessageType.html
         )
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(f"Connection error: {err}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
\ No newline at end of file
+        await fm.send_message(message)
+    except ConnectionErrors:
+        logger.exception("Connection error while sending email")
+    except Exception:
+        logger.exception("Error while sending email")
\ No newline at end of file
@@ -1,17 +1,21 @@
 import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from main import app
 from src.database.models import Base, User
 from src.database.db import get_db
 from src.services.auth import auth_service
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# Every pytest-xdist worker (gw0, gw1, ...) gets its own SQLite file; a plain run keeps test.db
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///./test_{_XDIST_WORKER}.db" if _XDIST_WORKER else "sqlite+aiosqlite:///./test.db"
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
@@ -22,7 +26,11 @@ TestingSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expi
 test_user = {"username": "deadpool", "email": "deadpool@example.com", "password": "12345678"}
 
 
-@pytest.fixture(scope="module", autouse=True)
+# Tests run in parallel with pytest-xdist: pytest -n auto tests
+# every worker gets its own database file, so the drop_all/create_all below never races
+# with another worker, and e2e tests seed their own rows instead of relying on test order;
+# the repository unit tests only use mocks and never touch the database.
+@pytest.fixture(scope="module")
 def init_models_wrap():
     async def init_models():
         async with engine.begin() as conn:
@@ -39,7 +47,7 @@ def init_models_wrap():
 
 
 @pytest.fixture(scope="module")
-def client():    
+def client(init_models_wrap):    
     async def override_get_db():
         session = TestingSessionLocal()
         try:
@@ -58,4 +66,25 @@ def client():
 @pytest_asyncio.fixture()
 async def get_token():
     token = await auth_service.create_access_token(data={"sub": test_user["email"]})
-    return token
\ No newline at end of file
+    return token
+
+
+class FakeAsyncSession:
+    # Only the AsyncSession methods the repositories call; add is synchronous
+    def __init__(self):
+        self.execute = AsyncMock()
+        self.stream_scalars = AsyncMock()
+        self.commit = AsyncMock()
+        self.refresh = AsyncMock()
+        self.delete = AsyncMock()
+        self.add = MagicMock()
+
+
+@pytest.fixture()
+def session():
+    return FakeAsyncSession()
+
+
+@pytest.fixture(scope="session")
+def user():
+    return User(id=1)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    # Stand-in for the Result returned by session.execute()
+    value: object = None
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class StreamResult:
+    # Stand-in for the AsyncScalarResult returned by session.stream_scalars()
+    rows: list = field(default_factory=list)
+    # Rows per partitions() batch when no size is passed, like yield_per
+    partition_size: int | None = None
+
+    async def all(self):
+        return self.rows
+
+    async def partitions(self, size=None):
+        size = size or self.partition_size or len(self.rows) or 1
+        for i in range(0, len(self.rows), size):
+            yield self.rows[i:i + size]
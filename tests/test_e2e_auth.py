@@ -1,23 +1,36 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock
-from sqlalchemy import select, delete
 from httpx import AsyncClient
 from main import app
 
 from src.database.models import User
+from src.services.auth import auth_service
 from tests.conftest import TestingSessionLocal
 from src.conf import messages
 
+
 user_data = {"username": "agent007", "email": "agent007@gmail.com", "password": "12345678"}
+# Login tests get their own users, so no test depends on test_signup having run first
+# (pytest-xdist may send tests of one module to different workers)
+unconfirmed_data = {"username": "agent006", "email": "agent006@gmail.com", "password": "12345678"}
+confirmed_data = {"username": "agent009", "email": "agent009@gmail.com", "password": "12345678"}
+
 
+@pytest.fixture(scope="module")
+def login_users(client):
+    async def create_users():
+        async with TestingSessionLocal() as session:
+            for data, confirmed in ((unconfirmed_data, False), (confirmed_data, True)):
+                session.add(User(username=data["username"], email=data["email"],
+                                 password=auth_service.get_password_hash(data["password"]), confirmed=confirmed))
+            await session.commit()
+
+    asyncio.run(create_users())
 
-@pytest.fixture(scope="function")
-async def clear_database():
-    async with TestingSessionLocal() as session:
-        await session.execute(delete(User))
-        await session.commit()
 
-def test_signup(client, monkeypatch, clear_database):
+def test_signup(client, monkeypatch):
     mock_send_email = Mock()
     monkeypatch.setattr("src.routes.auth.send_email", mock_send_email)
     response = client.post("api/auth/signup", json=user_data)
@@ -29,33 +42,35 @@ def test_signup(client, monkeypatch, clear_database):
     assert "avatar" in data
 
 
-def test_not_confirmed_login(client, clear_database):
+def test_not_confirmed_login(client, login_users):
     response = client.post("api/auth/login",
-                           data={"username": user_data.get("email"), "password": user_data.get("password")})
+                           data={"username": unconfirmed_data.get("email"), "password": unconfirmed_data.get("password")})
     assert response.status_code == 401, response.text
     data = response.json()
     assert data["detail"] == "Email not confirmed"
 
-@pytest.mark.asyncio
-async def test_login(client, clear_database):
-    async with TestingSessionLocal() as session:
-        current_user = await session.execute(select(User).where(User.email == user_data.get("email")))
-        current_user = current_user.scalar_one_or_none()
-        if current_user:
-            current_user.confirmed = True
-            await session.commit()
 
+def test_login(client, login_users):
     response = client.post("api/auth/login",
-                           data={"username": user_data.get("email"), "password": user_data.get("password")})
+                           data={"username": confirmed_data.get("email"), "password": confirmed_data.get("password")})
     assert response.status_code == 200, response.text
     data = response.json()
     assert "access_token" in data
     assert "refresh_token" in data
     assert "token_type" in data
 
-def test_wrong_password_login(client, clear_database):
+def test_wrong_password_login(client, login_users):
     response = client.post("api/auth/login",
-                           data={"username": user_data.get("email"), "password": "password"})
+                           data={"username": confirmed_data.get("email"), "password": "password"})
     assert response.status_code == 401, response.text
     data = response.json()
     assert data["detail"] == "Invalid password"
+
+
+def test_request_email_unknown_user(client, monkeypatch):
+    mock_send_email = Mock()
+    monkeypatch.setattr("src.routes.auth.send_email", mock_send_email)
+    response = client.post("api/auth/request_email", json={"email": "nobody@example.com"})
+    assert response.status_code == 200, response.text
+    assert response.json()["message"] == "Check your email for confirmation."
+    mock_send_email.assert_not_called()
@@ -0,0 +1,62 @@
+import pytest
+from fastapi_limiter import FastAPILimiter
+
+from main import app
+from src.database.models import User
+from src.services.auth import auth_service
+from tests.conftest import test_user
+
+
+contact_data = {"first_name": "John", "last_name": "Doe", "email": "john@example.com",
+                "phone_number": "1234567890", "birthday": "1990-12-31"}
+
+
+@pytest.fixture(scope="module")
+def auth_client(client):
+    # The seeded user is the first row of the fresh module database
+    app.dependency_overrides[auth_service.get_current_user] = lambda: User(id=1, email=test_user["email"])
+    yield client
+    app.dependency_overrides.pop(auth_service.get_current_user, None)
+
+
+def test_update_contact_hides_birthday_mmdd(auth_client):
+    response = auth_client.post("api/contacts/", json=contact_data)
+    assert response.status_code == 201, response.text
+    contact_id = response.json()["id"]
+
+    response = auth_client.put(f"api/contacts/{contact_id}", json={**contact_data, "first_name": "Jane"})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["first_name"] == "Jane"
+    assert "birthday_mmdd" not in data
+    assert "user_id" not in data
+
+
+def test_limited_routes_fail_open_without_redis(auth_client, monkeypatch):
+    # FastAPILimiter.init() never ran, as during a Redis outage at startup
+    monkeypatch.setattr(FastAPILimiter, "redis", None)
+    assert auth_client.get("api/contacts/search", params={"first_name": "John"}).status_code == 200
+    assert auth_client.get("api/contacts/birthday").status_code == 200
+
+
+def test_get_contacts_pages(auth_client):
+    for i in range(12):
+        response = auth_client.post("api/contacts/", json={**contact_data, "email": f"page{i}@example.com"})
+        assert response.status_code == 201, response.text
+
+    ids, after_id = [], None
+    while True:
+        params = {"limit": 10} if after_id is None else {"limit": 10, "after_id": after_id}
+        page = auth_client.get("api/contacts/", params=params).json()
+        page_ids = [item["id"] for item in page["items"]]
+        ids += page_ids
+        if len(page_ids) == 10:
+            # A full page points at its last id, the next page starts after it
+            assert page["next"] == page_ids[-1]
+            after_id = page["next"]
+        else:
+            assert page["next"] is None
+            break
+
+    assert len(ids) >= 12
+    assert ids == sorted(set(ids))
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import HTTPException
+from unittest.mock import MagicMock
+
+import main
+from src.conf.config import config
+from src.database.db import get_db
+
+
+def test_unknown_path_is_not_found(client):
+    assert client.get("api/nope").status_code == 404
+    assert client.post("api/contacts/zzz/yy").status_code == 404
+
+
+def test_preflight_is_answered_by_cors(client):
+    response = client.options("api/contacts", headers={
+        "Origin": config.CORS_ORIGINS[0],
+        "Access-Control-Request-Method": "GET",
+    })
+    assert response.status_code == 200, response.text
+    assert response.headers["access-control-max-age"] == "86400"
+
+
+@pytest.fixture()
+def fresh_healthcheck(monkeypatch):
+    monkeypatch.setattr(main, "_hc_cache", {"ts": 0.0, "ok": False})
+
+
+@pytest.mark.asyncio
+async def test_healthcheck_probe_is_cached(fresh_healthcheck, session):
+    session.execute.return_value = MagicMock()
+    await main.check_database(session)
+    await main.check_database(session)
+    # The second probe within HEALTHCHECK_TTL does not run SELECT 1
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_healthcheck_is_not_cached(fresh_healthcheck, session):
+    session.execute.side_effect = OSError("connection refused")
+    with pytest.raises(HTTPException) as exc:
+        await main.check_database(session)
+    assert exc.value.status_code == 500
+
+    session.execute.side_effect = None
+    session.execute.return_value = MagicMock()
+    await main.check_database(session)
+    assert session.execute.await_count == 2
+
+
+def test_liveness_does_not_use_database(client, monkeypatch):
+    def no_db():
+        raise AssertionError("liveness must not open a database session")
+    monkeypatch.setitem(main.app.dependency_overrides, get_db, no_db)
+    response = client.get("api/liveness")
+    assert response.status_code == 200, response.text
+
+
+def test_readiness(client, fresh_healthcheck):
+    response = client.get("api/readiness")
+    assert response.status_code == 200, response.text
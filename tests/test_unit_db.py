@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+from fastapi import HTTPException, status
+
+from src.database.db import DatabaseSessionManager
+
+
+@pytest.fixture()
+def manager():
+    return DatabaseSessionManager("sqlite+aiosqlite://")
+
+
+@pytest.mark.asyncio
+async def test_http_exception_is_not_logged(manager, caplog):
+    with caplog.at_level(logging.ERROR, logger="src.database.db"):
+        with pytest.raises(HTTPException):
+            async with manager.session():
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT FOUND")
+    assert caplog.records == []
+
+
+@pytest.mark.asyncio
+async def test_error_is_logged_with_traceback(manager, caplog):
+    with caplog.at_level(logging.ERROR, logger="src.database.db"):
+        with pytest.raises(ValueError):
+            async with manager.session():
+                raise ValueError("boom")
+    assert len(caplog.records) == 1
+    assert caplog.records[0].exc_info is not None
@@ -0,0 +1,30 @@
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from main import setup_logging
+
+
+@pytest.fixture()
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_setup_logging_after_restart(root_logger, capsys):
+    # startup, shutdown, startup again in the same process
+    setup_logging().stop()
+    listener = setup_logging()
+
+    logging.getLogger("tests.restart").warning("logged after restart")
+    listener.stop()  # drains the queue
+
+    assert "logged after restart" in capsys.readouterr().err
+    assert len([h for h in root_logger.handlers if isinstance(h, QueueHandler)]) == 1
@@ -0,0 +1,53 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from src.database.models import Base, Contact
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_birthday_mmdd_set_on_insert(db):
+    contact = Contact(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890",
+                      birthday=datetime.date(1990, 12, 31))
+    db.add(contact)
+    db.flush()
+    assert contact.birthday_mmdd == 1231
+
+
+def test_birthday_mmdd_set_on_update(db):
+    contact = Contact(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890",
+                      birthday=datetime.date(1990, 12, 31))
+    db.add(contact)
+    db.flush()
+    contact.birthday = datetime.date(1990, 2, 2)
+    db.flush()
+    assert contact.birthday_mmdd == 202
+
+    contact.birthday = None
+    db.flush()
+    assert contact.birthday_mmdd is None
+
+
+def test_search_indexes_declared_for_autogenerate():
+    # Must match migrations 5a1c8e0f7b23 / b94d3f6a2e18, or autogenerate emits drop_index for them
+    indexes = {ix.name: str(CreateIndex(ix).compile(dialect=postgresql.dialect()))
+               for ix in Base.metadata.tables["contacts"].indexes}
+    for column in ("first_name", "last_name", "email"):
+        assert indexes[f"ix_contacts_{column}_trgm"] == (
+            f"CREATE INDEX ix_contacts_{column}_trgm ON contacts USING gin ({column} gin_trgm_ops)"
+        )
+        assert indexes[f"ix_contacts_{column}_lower_prefix"] == (
+            f"CREATE INDEX ix_contacts_{column}_lower_prefix ON contacts (lower({column}) text_pattern_ops)"
+        )
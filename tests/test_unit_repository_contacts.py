@@ -1,8 +1,6 @@
-import unittest
-from unittest.mock import AsyncMock, MagicMock
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest
 from datetime import date, timedelta
-from src.database.models import User, Contact
+from src.database.models import Contact
 from src.schemas.contacts import ContactCreate, ContactUpdate
 from src.repository.contacts import (
     create,
@@ -13,129 +11,162 @@ from src.repository.contacts import (
     get_birthdays,
     search
 )
+from tests.stubs import Result, StreamResult
 
-class TestContactRepository(unittest.IsolatedAsyncioTestCase):
-
-    
-    async def test_create_contact(self):
-        # Mocking the database session
-        session = MagicMock(spec=AsyncSession)
-        # Mocking the user object
-        user = MagicMock(spec=User)
-        user.id = 1  # Установка атрибута id для пользователя
-
-        # Test parameters
-        body = ContactCreate(first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890", birthday="1990-01-01")
-
-        # Calling the function under test
-        result = await create(body, session, user)
-
-        # Verifying that the contact is created
-        self.assertIsInstance(result, Contact)
-        self.assertEqual(result.first_name, body.first_name)
-        self.assertEqual(result.last_name, body.last_name)
-        self.assertEqual(result.email, body.email)
-
-    async def test_get_contacts(self):
-        session = AsyncMock(spec=AsyncSession)
-        limit = 10
-        offset = 0
-        user = User(id=1)
-        contact = Contact(id=1, user_id=user.id, first_name="Test", last_name="Contact", email="test@example.com")
-        mock_result = MagicMock()
-        mock_result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[contact])))
-        session.execute = AsyncMock(return_value=mock_result)
-        result = await get_contacts(limit, offset, session, user)
-        self.assertEqual(result, [contact])
-
-    async def test_get_contact(self):
-        session = AsyncMock(spec=AsyncSession)
-        contact_id = 1
-        user = User(id=1)
-        contact = Contact(id=contact_id, user_id=user.id, first_name="Test", last_name="Contact", email="test@example.com")
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = contact
-        session.execute = AsyncMock(return_value=mock_result)
-        result = await get_contact(contact_id, session, user)
-        self.assertEqual(result, contact)
-
-    async def test_update_contact(self):
-        session = AsyncMock(spec=AsyncSession)
-        contact_id = 1
-        user = User(id=1)
-        body = ContactUpdate(
-            first_name="Jane", 
-            last_name="Doe", 
-            email="jane@example.com", 
-            phone_number="1234567890", 
-            birthday="1990-02-02"
-        )
-        contact = Contact(
-            id=contact_id, 
-            first_name="John", 
-            last_name="Doe", 
-            email="john@example.com", 
-            phone_number="1234567890", 
-            birthday="1990-01-01", 
-            user_id=user.id
-        )
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = contact
-        session.execute = AsyncMock(return_value=mock_result)
-        session.commit = AsyncMock()
-        session.refresh = AsyncMock()
-        result = await update_contact(contact_id, body, session, user)
-        self.assertEqual(result.first_name, body.first_name)
-        self.assertEqual(result.last_name, body.last_name)
-        self.assertEqual(result.email, body.email)
-        self.assertEqual(result.phone_number, body.phone_number)
-        self.assertEqual(result.birthday, body.birthday)
-
-    async def test_delete_contact(self):
-        session = AsyncMock(spec=AsyncSession)
-        contact_id = 1
-        user = User(id=1)
-        contact = Contact(id=contact_id, user_id=user.id)
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = contact
-        session.execute = AsyncMock(return_value=mock_result)
-        session.delete = AsyncMock()
-        session.commit = AsyncMock()
-        result = await delete_contact(contact_id, session, user)
-        self.assertEqual(result, contact)
-
-    async def test_get_birthdays(self):
-        session = AsyncMock(spec=AsyncSession)
-        days = 7
-        user = User(id=1)
-        today = date.today()
-        contacts = [
-            Contact(birthday=today + timedelta(days=i), user_id=user.id) for i in range(5)
-        ]
-        mock_result = MagicMock()
-        mock_result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=contacts)))
-        session.execute = AsyncMock(return_value=mock_result)
-        result = await get_birthdays(days, session, user)
-        expected_contacts = contacts[:days+1]
-        self.assertEqual(result, expected_contacts)
-
-    async def test_search(self):
-        session = AsyncMock(spec=AsyncSession)
-        user = User(id=1)
-        first_name = "John"
-        last_name = "Doe"
-        email = "john@example.com"
-        skip = 0
-        limit = 10
-        contact = Contact(id=1, first_name=first_name, last_name=last_name, email=email, user_id=user.id)
-        mock_result = MagicMock()
-        mock_result.scalars = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[contact])))
-        session.execute = AsyncMock(return_value=mock_result)
-        result = await search(first_name, last_name, email, skip, limit, session, user)
-        self.assertEqual(result, [contact])
-
-if __name__ == '__main__':
-    unittest.main()
 
+# Known-good payloads: model_construct skips validation, the schemas are not under test here
+CONTACT_CREATE_BODY = ContactCreate.model_construct(
+    first_name="John", last_name="Doe", email="john@example.com", phone_number="1234567890", birthday=date(1990, 1, 1)
+)
+CONTACT_UPDATE_BODY = ContactUpdate.model_construct(
+    first_name="Jane", last_name="Doe", email="jane@example.com", phone_number="1234567890", birthday=date(1990, 2, 2)
+)
+
+_TODAY = date.today()
+_BIRTHDAY_CONTACTS = [Contact(birthday=_TODAY + timedelta(days=i), user_id=1) for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_create_contact(session, user):
+    # Test parameters
+    body = CONTACT_CREATE_BODY
+
+    # Calling the function under test
+    result = await create(body, session, user)
+
+    # Verifying that the contact is created
+    session.add.assert_called_once_with(result)
+    assert isinstance(result, Contact)
+    assert result.first_name == body.first_name
+    assert result.last_name == body.last_name
+    assert result.email == body.email
+
+
+@pytest.mark.asyncio
+async def test_update_contact(session, user):
+    contact_id = 1
+    body = CONTACT_UPDATE_BODY
+    contact = Contact(id=contact_id, user_id=user.id)
+    session.execute.return_value = Result(contact)
+    result = await update_contact(contact_id, body, session, user)
+    session.execute.assert_called_once()
+    session.refresh.assert_not_called()
+    assert result is contact
+
+    # The bulk UPDATE does not fire before_update, so birthday_mmdd must be in its SET clause
+    params = session.execute.call_args.args[0].compile().params
+    assert params["first_name"] == body.first_name
+    assert params["last_name"] == body.last_name
+    assert params["email"] == body.email
+    assert params["phone_number"] == body.phone_number
+    assert params["birthday"] == body.birthday
+    assert params["birthday_mmdd"] == 202
+
+
+@pytest.mark.asyncio
+async def test_update_contact_without_birthday(session, user):
+    body = ContactUpdate.model_construct(_fields_set={"first_name"}, first_name="Jane")
+    session.execute.return_value = Result()
+    await update_contact(1, body, session, user)
+    params = session.execute.call_args.args[0].compile().params
+    assert "birthday" not in params
+    assert "birthday_mmdd" not in params
+
+
+# (repository function, args before db/user, mocked result kind, rows the mock returns)
+READ_CASES = [
+    (get_contacts, (10, None), "stream", lambda c: [c]),
+    (get_contact, (1,), "one", lambda c: c),
+    (delete_contact, (1,), "one", lambda c: c),
+    (get_birthdays, (7,), "stream", lambda c: _BIRTHDAY_CONTACTS),
+    (search, ("John", "Doe", "john@example.com", 0, 10), "stream", lambda c: [c]),
+]
+
+
+@pytest.fixture(scope="session")
+def sample_contact(user):
+    # Shared by the read cases only; tests that change a contact build their own
+    return Contact(id=1, user_id=user.id, first_name="John", last_name="Doe", email="john@example.com")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("func,args,mock_kind,expected_fn", READ_CASES, ids=[case[0].__name__ for case in READ_CASES])
+async def test_repo_read(func, args, mock_kind, expected_fn, session, user, sample_contact):
+    expected = expected_fn(sample_contact)
+    if mock_kind == "stream":
+        session.stream_scalars.return_value = StreamResult(expected)
+        result = await (await func(*args, session, user)).all()
+    else:
+        session.execute.return_value = Result(expected)
+        result = await func(*args, session, user)
+        session.execute.assert_called_once()
+    session.delete.assert_not_called()
+    assert result == expected
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_yield_per(session, user):
+    session.stream_scalars.return_value = StreamResult([])
+    await get_contacts(10, None, session, user)
+    stmt = session.stream_scalars.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 100
+
+
+def _compiled_sql(method):
+    stmt = method.call_args.args[0]
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_keyset(session, user):
+    await get_contacts(10, 42, session, user)
+    sql = _compiled_sql(session.stream_scalars)
+    assert "contacts.user_id = 1 AND contacts.id > 42" in sql
+    assert sql.endswith("ORDER BY contacts.id\n LIMIT 10")
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_first_page(session, user):
+    await get_contacts(10, None, session, user)
+    sql = _compiled_sql(session.stream_scalars)
+    assert "contacts.id >" not in sql
+    assert sql.endswith("ORDER BY contacts.id\n LIMIT 10")
+
+
+class _FixedDate(date):
+    # date.today() pinned by monkeypatching src.repository.contacts.date
+    fixed = date(2024, 6, 10)
+
+    @classmethod
+    def today(cls):
+        return cls.fixed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("today,days,expected", [
+    (date(2024, 6, 10), 7, "contacts.birthday_mmdd BETWEEN 610 AND 617"),
+    (date(2024, 6, 28), 7, "contacts.birthday_mmdd BETWEEN 628 AND 705"),
+    (date(2024, 12, 28), 7, "contacts.birthday_mmdd >= 1228 OR contacts.birthday_mmdd <= 104"),
+    (date(2024, 6, 10), 365, "contacts.birthday_mmdd IS NOT NULL"),
+], ids=["same_month", "month_boundary", "year_boundary", "whole_year"])
+async def test_get_birthdays_window(today, days, expected, session, user, monkeypatch):
+    monkeypatch.setattr(_FixedDate, "fixed", today)
+    monkeypatch.setattr("src.repository.contacts.date", _FixedDate)
+    await get_birthdays(days, session, user)
+    assert expected in _compiled_sql(session.stream_scalars)
+
+
+@pytest.mark.asyncio
+async def test_get_birthdays_huge_window(session, user):
+    # today + timedelta(days=3000000) is past date.max
+    await get_birthdays(3000000, session, user)
+    assert "contacts.birthday_mmdd IS NOT NULL" in _compiled_sql(session.stream_scalars)
 
 
+@pytest.mark.asyncio
+async def test_search_prefix(session, user):
+    session.stream_scalars.return_value = StreamResult()
+    await search("Jo", None, None, 0, 10, session, user, prefix=True)
+    stmt = session.stream_scalars.call_args.args[0]
+    compiled = stmt.compile(compile_kwargs={"literal_binds": True})
+    assert "lower(contacts.first_name) LIKE 'jo%'" in str(compiled)
@@ -1,94 +1,97 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User
 from src.repository.users import (
     get_user_by_email,
+    get_user_by_email_light,
     create_user,
+    gravatar_url,
     update_token,
     confirmed_email,
     update_avatar_url
 )
 from src.schemas.users import UserSchema
+from tests.stubs import Result
+
+USER_BODY = UserSchema.model_construct(email="test@example.com", username="testuser", password="testpwd")
+
+
+@pytest.fixture(scope="session")
+def stored_user():
+    # Read-only row handed back by the mocked lookups
+    return User(email="test@example.com")
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_email():
+async def test_get_user_by_email(session, stored_user):
     email = "test@example.com"
-    user = User(email=email)
+    user = stored_user
 
-    session = MagicMock(spec=AsyncSession)
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = AsyncMock(return_value=user)
-    session.execute = AsyncMock(return_value=mock_result)
+    session.execute.return_value = Result(user)
 
     result = await get_user_by_email(email, session)
-    result = await result  # добавляем await для корутины
     assert result == user
 
 
 @pytest.mark.asyncio
-async def test_create_user():
-    user_data = UserSchema(email="test@example.com", username="testuser", password="testpwd")
-    user = User(email=user_data.email)
-
-    session = MagicMock(spec=AsyncSession)
-    session.add = AsyncMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-
-    with patch("src.repository.users.Gravatar") as MockGravatar:
-        mock_gravatar = MockGravatar.return_value
-        mock_gravatar.get_image.return_value = "http://example.com/avatar.png"
-        result = await create_user(user_data, session)
-        session.add.assert_called_once()
-        session.commit.assert_called_once()
-        session.refresh.assert_called_once()
-        assert result.email == user.email
-        assert result.avatar == "http://example.com/avatar.png"
+async def test_get_user_by_email_light(session, stored_user):
+    email = "test@example.com"
+    user = stored_user
+
+    session.execute.return_value = Result(user)
+
+    result = await get_user_by_email_light(email, session)
+    stmt = str(session.execute.call_args.args[0])
+    assert "users.password" not in stmt
+    assert "users.refresh_token" not in stmt
+    assert result == user
 
 
 @pytest.mark.asyncio
-async def test_update_token():
+async def test_create_user(session):
+    user_data = USER_BODY
+
+    result = await create_user(user_data, session)
+    session.add.assert_called_once_with(result)
+    session.commit.assert_called_once()
+    session.refresh.assert_called_once()
+    assert result.email == user_data.email
+    assert result.avatar == "https://www.gravatar.com/avatar/55502f40dc8b7c769880b10874abc9d0"
+
+
+def test_gravatar_url_normalizes_email():
+    assert gravatar_url(" Test@Example.com ") == gravatar_url("test@example.com")
+
+
+@pytest.mark.asyncio
+async def test_update_token(session):
     user = User(email="test@example.com")
     token = "new_token"
 
-    session = MagicMock(spec=AsyncSession)
-    session.commit = AsyncMock()
-
     await update_token(user, token, session)
     assert user.refresh_token == token
     session.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_confirmed_email():
+async def test_confirmed_email(session):
     email = "test@example.com"
-    user = User(email=email)
-
-    session = MagicMock(spec=AsyncSession)
-    session.commit = AsyncMock()
 
-    with patch("src.repository.users.get_user_by_email", AsyncMock(return_value=user)):
-        await confirmed_email(email, session)
-        assert user.confirmed
-        session.commit.assert_called_once()
+    await confirmed_email(email, session)
+    session.execute.assert_called_once()
+    session.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_update_avatar_url():
+async def test_update_avatar_url(session):
     email = "test@example.com"
     url = "http://example.com/avatar.png"
-    user = User(email=email)
-
-    session = MagicMock(spec=AsyncSession)
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-
-    with patch("src.repository.users.get_user_by_email", AsyncMock(return_value=user)):
-        result = await update_avatar_url(email, url, session)
-        assert user.avatar == url
-        session.commit.assert_called_once()
-        session.refresh.assert_called_once()
-        assert result == user
+    user = User(email=email, avatar=url)
+
+    session.execute.return_value = Result(user)
+
+    result = await update_avatar_url(email, url, session)
+    session.execute.assert_called_once()
+    session.commit.assert_called_once()
+    session.refresh.assert_not_called()
+    assert result == user
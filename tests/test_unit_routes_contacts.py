@@ -0,0 +1,62 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from src.database.models import Contact
+from src.routes import contacts as contacts_routes
+from src.routes.contacts import _contacts_json
+from src.schemas.contacts import CONTACT_LIST_ADAPTER, ContactInDB, ContactPage
+from tests.stubs import StreamResult
+
+CONTACTS = [
+    Contact(id=i, first_name=f"John{i}", last_name="Doe", email=f"john{i}@example.com", phone_number="1234567890",
+            birthday=date(1990, 1, i), created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2), user_id=1)
+    for i in range(1, 6)
+]
+
+
+@pytest.mark.asyncio
+async def test_contacts_json_joins_partitions():
+    body, count, last_id = await _contacts_json(StreamResult(CONTACTS, partition_size=2))
+
+    # Three partitions (2 + 2 + 1) glued together must equal one list dump
+    assert body == CONTACT_LIST_ADAPTER.dump_json(CONTACT_LIST_ADAPTER.validate_python(CONTACTS))
+    assert CONTACT_LIST_ADAPTER.validate_json(body) == [ContactInDB.model_validate(c) for c in CONTACTS]
+    assert "birthday_mmdd" not in json.loads(body)[0]
+    assert count == 5
+    assert last_id == 5
+
+
+@pytest.mark.asyncio
+async def test_contacts_json_empty():
+    body, count, last_id = await _contacts_json(StreamResult())
+    assert body == b"[]"
+    assert json.loads(body) == []
+    assert count == 0
+    assert last_id is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit,expected_next", [(5, 5), (10, None)], ids=["full_page", "short_page"])
+async def test_get_contacts_page_matches_schema(limit, expected_next, session, user, monkeypatch):
+    async def get_contacts(*args):
+        return StreamResult(CONTACTS, partition_size=2)
+    monkeypatch.setattr(contacts_routes.repository_contacts, "get_contacts", get_contacts)
+
+    response = await contacts_routes.get_contacts(limit=limit, after_id=None, expand=False, db=session, user=user)
+
+    assert response.media_type == "application/json"
+    page = ContactPage.model_validate_json(response.body)
+    assert page == ContactPage(items=[ContactInDB.model_validate(c) for c in CONTACTS], next=expected_next)
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_empty_page(session, user, monkeypatch):
+    async def get_contacts(*args):
+        return StreamResult()
+    monkeypatch.setattr(contacts_routes.repository_contacts, "get_contacts", get_contacts)
+
+    response = await contacts_routes.get_contacts(limit=10, after_id=None, expand=False, db=session, user=user)
+
+    assert json.loads(response.body) == {"items": [], "next": None}
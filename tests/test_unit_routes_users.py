@@ -0,0 +1,23 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.database.models import User
+from src.routes import users as users_routes
+from src.services.auth import auth_service
+
+
+@pytest.mark.asyncio
+async def test_avatar_update_invalidates_cached_user(session, monkeypatch):
+    user = User(email="test@example.com")
+    updated = User(email=user.email, password="hash", refresh_token="token", avatar="http://example.com/avatar.png")
+    monkeypatch.setattr(users_routes.cloudinary.uploader, "upload", MagicMock(return_value={"version": 1}))
+    monkeypatch.setattr(users_routes.repositories_users, "update_avatar_url", AsyncMock(return_value=updated))
+    monkeypatch.setattr(auth_service, "invalidate_user", AsyncMock())
+    monkeypatch.setattr(auth_service, "cache_user", AsyncMock())
+
+    result = await users_routes.get_current_user(file=MagicMock(), user=user, db=session)
+
+    assert result is updated
+    # The full row (password hash, refresh token) must not end up in Redis
+    auth_service.cache_user.assert_not_called()
+    auth_service.invalidate_user.assert_awaited_once_with(user.email)
@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+from unittest.mock import AsyncMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.database.models import User
+from src.services.auth import auth_service
+
+EMAIL = "test@example.com"
+
+
+@pytest.fixture()
+def cache(monkeypatch):
+    cache = AsyncMock()
+    cache.get.return_value = None
+    monkeypatch.setattr(auth_service, "cache", cache)
+    return cache
+
+
+@pytest.fixture()
+def get_user_light(monkeypatch):
+    lookup = AsyncMock(return_value=User(id=1, email=EMAIL))
+    monkeypatch.setattr("src.services.auth.repository_users.get_user_by_email_light", lookup)
+    return lookup
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_database(cache, get_user_light, session):
+    cache.get.return_value = pickle.dumps(User(id=1, email=EMAIL))
+    token = await auth_service.create_access_token(data={"sub": EMAIL})
+
+    user = await auth_service.get_current_user(token, session)
+
+    assert user.email == EMAIL
+    cache.get.assert_awaited_once_with(f"user:{EMAIL}")
+    get_user_light.assert_not_called()
+    cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_loads_and_populates(cache, get_user_light, session):
+    token = await auth_service.create_access_token(data={"sub": EMAIL})
+
+    user = await auth_service.get_current_user(token, session)
+
+    get_user_light.assert_awaited_once_with(EMAIL, session)
+    key, raw = cache.set.call_args.args
+    assert key == f"user:{EMAIL}"
+    assert pickle.loads(raw).id == user.id
+    assert cache.set.call_args.kwargs == {"ex": auth_service.USER_CACHE_TTL}
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_deletes_key(cache):
+    await auth_service.invalidate_user(EMAIL)
+    cache.delete.assert_awaited_once_with(f"user:{EMAIL}")
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_database(cache, get_user_light, session):
+    cache.get.side_effect = RedisConnectionError("down")
+    cache.set.side_effect = RedisConnectionError("down")
+    token = await auth_service.create_access_token(data={"sub": EMAIL})
+
+    user = await auth_service.get_current_user(token, session)
+
+    assert user.email == EMAIL
+    get_user_light.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_ignores_redis_outage(cache):
+    cache.delete.side_effect = RedisConnectionError("down")
+    await auth_service.invalidate_user(EMAIL)
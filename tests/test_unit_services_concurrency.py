@@ -0,0 +1,86 @@
+import time
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeAsyncRedis
+from fastapi import HTTPException
+from fastapi_limiter import FastAPILimiter
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.database.models import User
+from src.services.concurrency import ConcurrencyLimiter
+
+USER = User(id=1, email="test@example.com")
+KEY = f"{FastAPILimiter.prefix}:concurrency:{USER.email}"
+
+
+@pytest_asyncio.fixture()
+async def redis(monkeypatch):
+    redis = FakeAsyncRedis()
+    monkeypatch.setattr(FastAPILimiter, "redis", redis)
+    yield redis
+    await redis.aclose()
+
+
+async def acquire(limiter):
+    # Drive the dependency like FastAPI does: run it up to its yield
+    slot = limiter(USER)
+    await slot.__anext__()
+    return slot
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_all_slots_taken(redis):
+    limiter = ConcurrencyLimiter(max_concurrent=2)
+    slots = [await acquire(limiter), await acquire(limiter)]
+
+    with pytest.raises(HTTPException) as exc:
+        await acquire(limiter)
+    assert exc.value.status_code == 429
+    assert await redis.zcard(KEY) == 2
+
+    for slot in slots:
+        await slot.aclose()
+    assert await redis.zcard(KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_slots_expire(redis):
+    limiter = ConcurrencyLimiter(max_concurrent=1, ttl=60)
+    # A slot left behind by a crashed request, older than ttl
+    await redis.zadd(KEY, {"crashed": time.time() - 61})
+
+    slot = await acquire(limiter)
+    assert b"crashed" not in await redis.zrange(KEY, 0, -1)
+    assert await redis.zcard(KEY) == 1
+    await slot.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slot_released_when_endpoint_raises(redis):
+    limiter = ConcurrencyLimiter(max_concurrent=1)
+    slot = await acquire(limiter)
+
+    # FastAPI throws the endpoint's exception into the dependency
+    with pytest.raises(ValueError):
+        await slot.athrow(ValueError("boom"))
+    assert await redis.zcard(KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_limiter_redis(monkeypatch):
+    monkeypatch.setattr(FastAPILimiter, "redis", None)
+    slot = await acquire(ConcurrencyLimiter(max_concurrent=1))
+    await slot.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fails_open_on_redis_error(monkeypatch):
+    redis = MagicMock()
+    redis.register_script.return_value = AsyncMock(side_effect=RedisConnectionError("down"))
+    monkeypatch.setattr(FastAPILimiter, "redis", redis)
+
+    slot = await acquire(ConcurrencyLimiter(max_concurrent=1))
+    await slot.aclose()
+    redis.zrem.assert_not_called()